@@ -35,7 +35,8 @@ setup(
     url='http://github.com/vpelletier/python-spidev2',
     license='GPLv3+',
     platforms=['linux'],
-    packages=['spidev2'],
+    packages=['spidev2', 'spidev2.tests'],
+    test_suite='spidev2.tests.test_spidev2',
     install_requires=[
         'ioctl-opt',
     ],
@@ -19,12 +19,17 @@
 A pure-pyton gpio implemtation using spidev chardev.
 """
 
+import collections
 import ctypes
-import errno
 from fcntl import ioctl
-import io
+import functools
+import os
+import struct
+import threading
+import weakref
 from .linux_spidev import (
     spi_ioc_transfer,
+    spi_ioc_transfer_struct,
     SPIMode32,
     SPI_MODE_X_MASK,
     SPI_MODE_USER_MASK,
@@ -45,15 +50,138 @@ __version__ = _version.get_versions()['version']
 # package.
 __all__ = (
     "SPIMode32", "SPI_MODE_X_MASK", "SPI_MODE_USER_MASK", "SPITransfer",
-    "SPITransferList", "SPIBus",
+    "SPITransferList", "SPITransferPool", "SPIBus", "reverseBits",
+    "compileTransferSchedule",
 )
 
-_SPI_IOC_MESSAGE_1 = SPI_IOC_MESSAGE(1)
+_SPI_MODE_NON_USER_MASK = ~SPI_MODE_USER_MASK
 
-class SPITransfer:
+@functools.lru_cache(maxsize=64)
+def _getIOCMessage(transfer_count):
+    """
+    Cached SPI_IOC_MESSAGE, as it creates a new ctypes array type on every
+    call.
+    """
+    return SPI_IOC_MESSAGE(transfer_count)
+
+# Single-transfer submissions are the most frequent: avoid the cache lookup.
+_SPI_IOC_MESSAGE_1 = _getIOCMessage(1)
+
+_c_char_from_buffer = ctypes.c_char.from_buffer
+_addressof = ctypes.addressof
+_PACK_TRANSFER_INTO = spi_ioc_transfer_struct.pack_into
+# spi_ioc_transfer starts with its tx_buf and rx_buf fields.
+_PACK_BUFFER_ADDRESSES_INTO = struct.Struct('=QQ').pack_into
+_SPI_IOC_TRANSFER_SIZE = ctypes.sizeof(spi_ioc_transfer)
+
+def _getBufferAddress(buf, writable):
+    """
+    Returns the address of buf's first byte, and an object which must stay
+    referenced for as long as this address is in use.
+
+    The returned object holds an export of buf's buffer, which prevents buf
+    from being resized (and its memory from moving) while it is referenced.
+
+    If writable is false and buf does not expose a writable buffer (ex: bytes),
+    a copy of buf is made. Otherwise, buf must expose a writable buffer.
+    """
+    try:
+        # Only get the first char, this will only be used to get a pointer to
+        # buf's first byte.
+        raw = _c_char_from_buffer(buf)
+    except TypeError:
+        if writable:
+            raise
+        # Slow path: copy buf, to tolerate caller providing an
+        # immutable/non-buffer-protocol object.
+        raw = ctypes.create_string_buffer(buf)
+    return _addressof(raw), raw
+
+def _getTransferBuffers(tx_buf, rx_buf):
+    """
+    Checks and acquires a transfer's buffers, as described in
+    SPITransfer.__init__ .
+
+    Returns (length, tx_buf_address, tx_buf_raw, rx_buf_address, rx_buf_raw),
+    where *_raw are the objects which must stay referenced for as long as the
+    corresponding address is in use (None for a None buffer).
+    """
+    if tx_buf is None:
+        if rx_buf is None:
+            raise ValueError("neither tx_buf nor rx_buf was provided")
+        length = len(rx_buf)
+        rx_buf_address, rx_buf_raw = _getBufferAddress(rx_buf, writable=True)
+        return length, 0, None, rx_buf_address, rx_buf_raw
+    length = len(tx_buf)
+    tx_buf_address, tx_buf_raw = _getBufferAddress(
+        tx_buf,
+        # If it is also rx_buf, it must not be copied.
+        writable=tx_buf is rx_buf,
+    )
+    if rx_buf is None:
+        rx_buf_address = 0
+        rx_buf_raw = None
+    elif rx_buf is tx_buf:
+        # Same object both ways: reuse its address, length is known equal.
+        rx_buf_address = tx_buf_address
+        rx_buf_raw = tx_buf_raw
+    else:
+        if len(rx_buf) != length:
+            raise ValueError('mismatched lengths')
+        rx_buf_address, rx_buf_raw = _getBufferAddress(rx_buf, writable=True)
+    return length, tx_buf_address, tx_buf_raw, rx_buf_address, rx_buf_raw
+
+def _checkReplacementLength(new_buf, other_buf, length):
+    """
+    Returns new_buf's length, after checking it matches the current transfer
+    length if other_buf (the buffer being kept) is not None.
+    """
+    new_length = len(new_buf)
+    if other_buf is not None and new_length != length:
+        raise ValueError('mismatched lengths')
+    return new_length
+
+_scratch_local = threading.local()
+
+def _getScratchTransfer():
+    """
+    Returns a spi_ioc_transfer private to the current thread, for transfers
+    which do not outlive the ioctl submitting them.
+    Not reentrant: callers must not allow another use of it until their ioctl
+    returns.
+    """
+    try:
+        return _scratch_local.transfer
+    except AttributeError:
+        _scratch_local.transfer = result = spi_ioc_transfer()
+        return result
+
+_BIT_REVERSE_TABLE = bytes(
+    int(f'{x:08b}'[::-1], 2)
+    for x in range(256)
+)
+
+def reverseBits(buf):
+    """
+    buf (writable buffer)
+
+    Reverses the bit order of each byte in buf, in place.
+
+    For SPI controllers which do not support SPIMode32.SPI_LSB_FIRST: reverse
+    tx_buf before submitting the transfer, and rx_buf after it completes.
+    """
+    with memoryview(buf) as view, view.cast('B') as byte_view:
+        byte_view[:] = byte_view.tobytes().translate(_BIT_REVERSE_TABLE)
+
+class SPITransfer: # pylint: disable=too-many-instance-attributes
     """
     A bidirectional SPI transfer block.
     """
+    # Weak reference to the SPITransferList containing this transfer, if any.
+    _owner = None
+    # rx_buf exports made visible through __array_interface__, by rx_buf id.
+    _exported_rx_buf_raw_dict = None
+
     def __init__( # pylint: disable=too-many-arguments
         self,
         tx_buf=None,
@@ -66,6 +194,7 @@ class SPITransfer:
         rx_nbits=0,
         word_delay_usecs=0,
         transfer=None,
+        owner=None,
     ):
         """
         tx_buf (None or bytes or buffer)
@@ -73,6 +202,7 @@ class SPITransfer:
             If it is a buffer object (ex: memoryview), its content may be
             modified before resubmitting the transfer, allowing to reuse
             SPITransfer instances.
+            To reuse an instance with different buffers, see updateBuffers.
         rx_buf (None or buffer)
             Data received over the SPI bus.
         delay_usecs (int, 0 to 65535)
@@ -93,54 +223,111 @@ class SPITransfer:
             If non-zero, override the current bus' setting for this transfer.
             {r,t}x_nbits overrides (single)/SPI_{R,T}X_DUAL/SPI_{R,T}X_QUAD.
         transfer (spi_ioc_transfer)
+        owner (weakref to SPITransferList)
             For SPITransferList use only.
 
         At least one of tx_buf and rx_buf must be non-None.
-        Both tx_buf and rx_buf may reference the same memory.
-        """
-        if tx_buf is None:
-            tx_buf_address = 0
-        else:
-            length = len(tx_buf)
-            try:
-                # Only get the first char, this will only be used to get a
-                # pointer to tx_buf's first byte.
-                tx_buf_raw = ctypes.c_char.from_buffer(tx_buf)
-            except TypeError:
-                # Slow path: copy tx_buf, to tolerate caller providing an
-                # immutable/non-buffer-protocol object.
-                self._tx_buf_raw = tx_buf_raw = ctypes.create_string_buffer(
-                    tx_buf,
-                )
-            tx_buf_address = ctypes.addressof(tx_buf_raw)
-        if rx_buf is None:
-            rx_buf_address = 0
-            if tx_buf is None:
-                raise ValueError("neither tx_buf nor rx_buf was provided")
-        else:
-            # rx_buf *must* be mutable and ctypes-compatible. This will raise if
-            # it is not.
-            rx_buf_address = ctypes.addressof(ctypes.c_char.from_buffer(rx_buf))
-            if tx_buf is None:
-                length = len(rx_buf)
-            else:
-                if len(rx_buf) != length:
-                    raise ValueError('mismatched lengths')
+        Both tx_buf and rx_buf may reference the same memory. Passing the same
+        object as both is the cheapest option.
+        """
+        (
+            length,
+            tx_buf_address,
+            self._tx_buf_raw,
+            rx_buf_address,
+            self._rx_buf_raw,
+        ) = _getTransferBuffers(tx_buf, rx_buf)
         self._rx_buf = rx_buf
+        self._rx_address = rx_buf_address
+        self._rx_length = length
         self._tx_buf = tx_buf
         if transfer is None:
             transfer = spi_ioc_transfer()
+        # Set all fields in a single call, rather than going through each
+        # field's ctypes descriptor.
+        _PACK_TRANSFER_INTO(
+            transfer,
+            0,
+            tx_buf_address,
+            rx_buf_address,
+            length,
+            speed_hz,
+            delay_usecs,
+            bits_per_word,
+            cs_change,
+            tx_nbits,
+            rx_nbits,
+            word_delay_usecs,
+            0, # pad
+        )
         self._transfer = transfer
-        transfer.tx_buf = tx_buf_address
-        transfer.rx_buf = rx_buf_address
+        if owner is not None:
+            self._owner = owner
+
+    def updateBuffers(self, tx_buf=None, rx_buf=None):
+        """
+        tx_buf (None or bytes or buffer)
+        rx_buf (None or buffer)
+            New buffers for this transfer, as for the constructor. None keeps
+            the current buffer.
+
+        Only the address of the replaced buffer is recomputed: this is cheaper
+        than creating a new SPITransfer.
+        When both tx_buf and rx_buf are set, they must have the same length,
+        which becomes this transfer's length.
+        rx_bufs exposed through __array_interface__ (ex: to numpy.asarray)
+        stay referenced for as long as this transfer, so arrays obtained
+        before this call remain valid.
+        """
+        tx_buf_changed = tx_buf is not None and tx_buf is not self._tx_buf
+        rx_buf_changed = rx_buf is not None and rx_buf is not self._rx_buf
+        transfer = self._transfer
+        # Acquire everything before modifying this transfer, so it is left
+        # unchanged on error.
+        if tx_buf_changed and rx_buf_changed:
+            (
+                length,
+                tx_buf_address,
+                tx_buf_raw,
+                rx_buf_address,
+                rx_buf_raw,
+            ) = _getTransferBuffers(tx_buf, rx_buf)
+        elif tx_buf_changed:
+            rx_buf = self._rx_buf
+            rx_buf_address = self._rx_address
+            rx_buf_raw = self._rx_buf_raw
+            length = _checkReplacementLength(tx_buf, rx_buf, self._rx_length)
+            if tx_buf is rx_buf:
+                tx_buf_address = rx_buf_address
+                tx_buf_raw = rx_buf_raw
+            else:
+                tx_buf_address, tx_buf_raw = _getBufferAddress(
+                    tx_buf,
+                    writable=False,
+                )
+        elif rx_buf_changed:
+            tx_buf = self._tx_buf
+            tx_buf_address = transfer.tx_buf
+            tx_buf_raw = self._tx_buf_raw
+            length = _checkReplacementLength(rx_buf, tx_buf, self._rx_length)
+            rx_buf_address, rx_buf_raw = _getBufferAddress(
+                rx_buf,
+                writable=True,
+            )
+        else:
+            return
+        self._tx_buf = tx_buf
+        self._tx_buf_raw = tx_buf_raw
+        self._rx_buf = rx_buf
+        self._rx_buf_raw = rx_buf_raw
+        self._rx_address = rx_buf_address
+        self._rx_length = length
+        _PACK_BUFFER_ADDRESSES_INTO(transfer, 0, tx_buf_address, rx_buf_address)
         transfer.len = length
-        transfer.speed_hz = speed_hz
-        transfer.bits_per_word = bits_per_word
-        transfer.delay_usecs = delay_usecs
-        transfer.cs_change = cs_change
-        transfer.tx_nbits = tx_nbits
-        transfer.rx_nbits = rx_nbits
-        transfer.word_delay_usecs = word_delay_usecs
+        if rx_buf_changed and self._owner is not None:
+            owner = self._owner()
+            if owner is not None:
+                owner._rx_buf_tuple = None # pylint: disable=protected-access
 
     @property
     def tx_buf(self):
@@ -157,6 +344,52 @@ class SPITransfer:
         """
         return self._rx_buf
 
+    @property
+    def rx_bytes(self):
+        """
+        A bytes copy of rx_buf's content, or None if there is no rx_buf.
+
+        Faster than bytes(rx_buf) for rx_buf types which do not implement
+        their own fast copy (ex: ctypes arrays), as the copy is done from
+        rx_buf's address in a single memcpy.
+        To access received data without any copy, use memoryview(rx_buf).
+        """
+        if self._rx_address:
+            return ctypes.string_at(self._rx_address, self._rx_length)
+        return None
+
+    @property
+    def __array_interface__(self):
+        """
+        NumPy array interface, exposing rx_buf as a 1-dimension array of bytes
+        without copying it (ex: numpy.asarray(transfer)).
+        """
+        if not self._rx_address:
+            raise AttributeError('__array_interface__')
+        # The consumer only keeps a reference to this transfer: keep this
+        # rx_buf export alive even if updateBuffers replaces it.
+        # One entry per distinct rx_buf (which the export keeps alive, so its
+        # id cannot be reused), to not grow on repeated accesses.
+        exported_rx_buf_raw_dict = self._exported_rx_buf_raw_dict
+        if exported_rx_buf_raw_dict is None:
+            self._exported_rx_buf_raw_dict = exported_rx_buf_raw_dict = {}
+        exported_rx_buf_raw_dict.setdefault(id(self._rx_buf), self._rx_buf_raw)
+        return {
+            'shape': (self._rx_length, ),
+            'typestr': '|u1',
+            'data': (self._rx_address, False),
+            'version': 3,
+        }
+
+    def __buffer__(self, flags): # pylint: disable=unused-argument
+        """
+        Buffer protocol (PEP 688), delegated to rx_buf.
+        """
+        return memoryview(self._rx_buf)
+
+    def __release_buffer__(self, view):
+        view.release()
+
     @property
     def transfer(self):
         """
@@ -164,6 +397,91 @@ class SPITransfer:
         """
         return self._transfer
 
+class _PooledSPITransfer(SPITransfer):
+    """
+    A SPITransfer which returns to its SPITransferPool when used as a context
+    manager.
+    """
+    def __init__(self, pool, pool_key, **kw):
+        super().__init__(**kw)
+        self._pool = pool
+        self._pool_key = pool_key
+        self._in_pool = False
+
+    def updateBuffers(self, tx_buf=None, rx_buf=None):
+        """
+        Not available on pooled transfers: they are recycled based on their
+        buffer length.
+        """
+        raise TypeError('Cannot replace buffers of a pooled transfer')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._pool.release(self)
+
+class SPITransferPool:
+    """
+    A pool of reusable full-duplex SPITransfer blocks.
+
+    Useful when the same transfer shape is submitted repeatedly: buffers and
+    transfer structures are only allocated the first time a given shape is
+    requested, and recycled afterwards.
+    """
+    def __init__(self):
+        self._pool_dict = collections.defaultdict(collections.deque)
+
+    def acquire(self, length, **kw):
+        """
+        length (int)
+            Transfer length, in bytes.
+        kw
+            Other SPITransfer.__init__ arguments, except tx_buf, rx_buf and
+            transfer.
+
+        Returns a SPITransfer whose tx_buf and rx_buf are the same bytearray
+        of given length. Its content is whatever the previous user of this
+        transfer left in it.
+        It may be used as a context manager, which releases it to this pool on
+        exit:
+            with pool.acquire(4, speed_hz=1_000_000) as transfer:
+                transfer.tx_buf[:2] = b'\x12\x34'
+                received = bytes(bus.submitTransfer(transfer)[2:])
+        """
+        key = (length, tuple(sorted(kw.items())))
+        try:
+            transfer = self._pool_dict[key].pop()
+        except IndexError:
+            buf = bytearray(length)
+            return _PooledSPITransfer(
+                pool=self,
+                pool_key=key,
+                tx_buf=buf,
+                rx_buf=buf,
+                **kw
+            )
+        transfer._in_pool = False # pylint: disable=protected-access
+        return transfer
+
+    def release(self, transfer):
+        """
+        transfer (SPITransfer)
+            A transfer obtained from this pool's acquire method, which must not
+            be used by caller after this call.
+
+        Raises ValueError if transfer does not come from this pool, or was
+        already released.
+        """
+        # pylint: disable=protected-access
+        if getattr(transfer, '_pool', None) is not self:
+            raise ValueError('Transfer does not belong to this pool')
+        if transfer._in_pool:
+            raise ValueError('Transfer already released')
+        transfer._in_pool = True
+        self._pool_dict[transfer._pool_key].append(transfer)
+        # pylint: enable=protected-access
+
 class SPITransferList:
     """
     A list of bidirectional SPI transfer blocks.
@@ -175,14 +493,18 @@ class SPITransferList:
             objects.
         """
         self._length = length = len(kw_list)
-        self._transfer_list = (spi_ioc_transfer * length)()
-        self._spi_transfer_list = spi_transfer_list = []
-        for transfer, transfer_kw in zip(self._transfer_list, kw_list):
-            spi_transfer_list.append(SPITransfer(
-                transfer=transfer,
-                **transfer_kw
-            ))
-        self._ioctl_request = SPI_IOC_MESSAGE(length)
+        self._transfer_list = transfer_list = (spi_ioc_transfer * length)()
+        # Build all SPITransfers in a single comprehension: this avoids
+        # per-item list.append lookups and calls.
+        # Weak, to not create a reference cycle which would delay releasing
+        # buffers until the next cyclic garbage collection.
+        owner = weakref.ref(self)
+        self._spi_transfer_list = [
+            SPITransfer(transfer=transfer, owner=owner, **transfer_kw)
+            for transfer, transfer_kw in zip(transfer_list, kw_list)
+        ]
+        self._rx_buf_tuple = None
+        self._ioctl_request = _getIOCMessage(length)
 
     def __len__(self):
         """
@@ -202,6 +524,52 @@ class SPITransferList:
         """
         return iter(self._spi_transfer_list)
 
+    @property
+    def rx_buf_tuple(self):
+        """
+        The rx_buf of each contained SPITransfer, in order.
+        """
+        result = self._rx_buf_tuple
+        if result is None:
+            self._rx_buf_tuple = result = tuple(
+                x.rx_buf for x in self._spi_transfer_list
+            )
+        return result
+
+    @property
+    def raw_array(self):
+        """
+        Writable, zero-copy view of the underlying spi_ioc_transfer array, as
+        a memoryview of unsigned bytes with shape
+        (len(self), ctypes.sizeof(spi_ioc_transfer)).
+
+        For building large transfer lists without going through SPITransfer
+        (ex: with numpy.asarray(transfer_list.raw_array) and a structured
+        dtype). Native-endian field offsets within each row:
+          0 tx_buf (uint64, address)
+          8 rx_buf (uint64, address)
+         16 len (uint32)
+         20 speed_hz (uint32)
+         24 delay_usecs (uint16)
+         26 bits_per_word (uint8)
+         27 cs_change (uint8)
+         28 tx_nbits (uint8)
+         29 rx_nbits (uint8)
+         30 word_delay_usecs (uint8)
+         31 pad (uint8, must be zero)
+
+        Changes made through this view are not reflected in the contained
+        SPITransfers (nor in rx_buf_tuple). Caller is responsible for keeping
+        the memory referenced by any address written here valid until all
+        submissions using it have completed.
+        """
+        if not self._length:
+            raise ValueError('empty transfer list')
+        return memoryview(self._transfer_list).cast('B').cast(
+            'B',
+            shape=[self._length, _SPI_IOC_TRANSFER_SIZE],
+        )
+
     @property
     def ioctl_args(self):
         """
@@ -209,25 +577,150 @@ class SPITransferList:
         """
         return (self._ioctl_request, self._transfer_list)
 
-class SPIBus(io.FileIO):
+_SCHEDULE_ENTRY_KEY_SET = frozenset((
+    'len', 'speed_hz', 'bits_per_word', 'delay_usecs', 'cs_change',
+    'tx_nbits', 'rx_nbits', 'word_delay_usecs',
+))
+
+def compileTransferSchedule(schema):
+    """
+    schema (list of dicts)
+        One dict per transfer. 'len' (transfer length, in bytes) is mandatory.
+        Other keys are optional, and are SPITransfer.__init__ arguments
+        besides tx_buf, rx_buf and transfer.
+
+    Prepares a fixed sequence of transfers once, so that each submission only
+    has to set buffer addresses before issuing the ioctl.
+
+    Returns a function submit(bus, tx_bufs, rx_bufs):
+        bus (SPIBus)
+            The bus to submit transfers on.
+        tx_bufs (sequence of None or bytes or buffer)
+        rx_bufs (sequence of None or buffer)
+            One item per schema entry, of that entry's length, with the same
+            meaning as SPITransfer.__init__'s tx_buf and rx_buf.
+        Returns rx_bufs.
+    The returned function is not reentrant: it must not be called again,
+    including from another thread, before it returns.
+    """
+    length = len(schema)
+    transfer_array = (spi_ioc_transfer * length)()
+    transfer_len_list = []
+    for index, entry in enumerate(schema):
+        unknown_key_set = set(entry).difference(_SCHEDULE_ENTRY_KEY_SET)
+        if unknown_key_set:
+            raise ValueError(f'unknown keys: {sorted(unknown_key_set)!r}')
+        try:
+            transfer_len = entry['len']
+        except KeyError:
+            raise ValueError('missing key: len') from None
+        transfer_len_list.append(transfer_len)
+        _PACK_TRANSFER_INTO(
+            transfer_array,
+            index * _SPI_IOC_TRANSFER_SIZE,
+            0, # tx_buf, set on submission
+            0, # rx_buf, set on submission
+            transfer_len,
+            entry.get('speed_hz', 0),
+            entry.get('delay_usecs', 0),
+            entry.get('bits_per_word', 0),
+            entry.get('cs_change', False),
+            entry.get('tx_nbits', 0),
+            entry.get('rx_nbits', 0),
+            entry.get('word_delay_usecs', 0),
+            0, # pad
+        )
+    request = _getIOCMessage(length)
+
+    def submit(bus, tx_bufs, rx_bufs):
+        if len(tx_bufs) != length or len(rx_bufs) != length:
+            raise ValueError(f'expected {length} tx and rx buffers')
+        # Buffer exports must stay referenced until the ioctl returns.
+        keepalive_list = []
+        offset = 0
+        for transfer_len, tx_buf, rx_buf in zip(
+            transfer_len_list,
+            tx_bufs,
+            rx_bufs,
+        ):
+            (
+                buf_len,
+                tx_buf_address,
+                tx_buf_raw,
+                rx_buf_address,
+                rx_buf_raw,
+            ) = _getTransferBuffers(tx_buf, rx_buf)
+            if buf_len != transfer_len:
+                raise ValueError('mismatched lengths')
+            keepalive_list.append((tx_buf_raw, rx_buf_raw))
+            _PACK_BUFFER_ADDRESSES_INTO(
+                transfer_array,
+                offset,
+                tx_buf_address,
+                rx_buf_address,
+            )
+            offset += _SPI_IOC_TRANSFER_SIZE
+        ioctl(bus.fileno(), request, transfer_array)
+        return rx_bufs
+    return submit
+
+def _getOpenFlags(mode):
+    """
+    Converts an io.FileIO mode string into os.open access mode flags.
+    """
+    if (
+        not set(mode).issubset('rwb+') or
+        len(set(mode)) != len(mode) or
+        ('r' in mode) == ('w' in mode)
+    ):
+        raise ValueError(f'invalid mode: {mode!r}')
+    if '+' in mode:
+        return os.O_RDWR
+    if 'r' in mode:
+        return os.O_RDONLY
+    return os.O_WRONLY
+
+class SPIBus: # pylint: disable=too-many-instance-attributes
     """
     Wrapper for the /dev/spidev*.* device class.
     Implements spidev ioctl calls in a pythonic way.
 
     See transfer/submitTransferList for full-duplex and/or chained transfers
     (ex: to control how/when the chip-select signal is released).
-    Regular read/write (and derivatives, like readinto) methods are available
-    for half-duplex transfers.
+    read/write/readinto methods are available for half-duplex transfers.
+
+    On CPython, the GIL is released while the kernel executes transfers, so
+    other threads may run during long transfers. They must not modify the
+    buffers involved in a transfer until it completes.
     """
-    def __init__(
+    _fd = -1
+
+    def __init__( # pylint: disable=too-many-arguments
         self,
-        *args,
+        file,
+        mode='r',
+        closefd=True,
+        opener=None,
+        *,
         bits_per_word=None,
         speed_hz=None,
-        spi_mode=None,
-        **kw
+        spi_mode=None
     ):
         """
+        file (str, bytes, path-like or int)
+            Path of the spidev device to open, or an already-open file
+            descriptor.
+        mode (str)
+            As for io.FileIO: 'r' to read, 'w' to write, '+' for both. 'b' is
+            accepted and ignored.
+            Only read/write/readinto depend on it, ioctls (including
+            transfers) are available in all modes.
+        closefd (bool)
+            When file is a file descriptor, whether to close it when this
+            instance is closed.
+        opener (None or callable)
+            As for io.FileIO: if not None, called with (file, flags) to open
+            file, and must return an open file descriptor.
         bits_per_word (None, int)
             If not None, number of bits per SPI word to immediately set.
             Transfers must be of a whole number of round-up-to-power-of-two
@@ -238,7 +731,25 @@ class SPIBus(io.FileIO):
         spi_mode (None, SPIMode32 flags)
             If not None, bus mode flags to immediately set.
         """
-        super().__init__(*args, **kw)
+        flags = _getOpenFlags(mode)
+        if isinstance(file, int):
+            if file < 0:
+                raise ValueError('negative file descriptor')
+            self._closefd = closefd
+            self._fd = file
+        else:
+            if not closefd:
+                raise ValueError('Cannot use closefd=False with file name')
+            self._closefd = True
+            flags |= os.O_CLOEXEC
+            if opener is None:
+                self._fd = os.open(file, flags)
+            else:
+                fd = opener(file, flags)
+                if fd < 0:
+                    raise ValueError(f'opener returned {fd}')
+                self._fd = fd
+        self.invalidateCache()
         if bits_per_word is not None:
             self.bits_per_word = bits_per_word
         if speed_hz is not None:
@@ -246,45 +757,103 @@ class SPIBus(io.FileIO):
         if spi_mode is not None:
             self.spi_mode = spi_mode
 
-    def _ioctl(self, request, arg=0):
-        if ioctl(self.fileno(), request, arg) == -1:
-            raise OSError
+    def __del__(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def closed(self):
+        """
+        Whether this instance is closed.
+        """
+        return self._fd == -1
+
+    def close(self):
+        """
+        Close the underlying file descriptor, if this instance owns it.
+        Further operations on this instance will fail.
+        """
+        fd = self._fd
+        if fd != -1:
+            self._fd = -1
+            if self._closefd:
+                os.close(fd)
+
+    def fileno(self):
+        """
+        The underlying file descriptor.
+        """
+        if self._fd == -1:
+            raise ValueError('I/O operation on closed file')
+        return self._fd
 
-    def seekable(self):
+    def read(self, size):
         """
-        Chardevs are not seekable.
+        Half-duplex reception of size bytes.
+        Unlike io.FileIO.read, size is mandatory: spidev devices have no end
+        of file to read up to.
         """
-        return False
+        return os.read(self.fileno(), size)
 
-    def seek(self, pos, whence=0):
+    def readinto(self, buf):
         """
-        Always raises OSError.
+        Half-duplex reception into buf (writable buffer).
+
+        Returns the number of bytes received.
         """
-        raise OSError(errno.ENOTSUP)
+        return os.readv(self.fileno(), (buf, ))
 
-    def tell(self):
+    def write(self, buf):
         """
-        Always raises OSError.
+        Half-duplex transmission of buf.
+
+        Returns the number of bytes sent.
         """
-        raise OSError(errno.ENOTSUP)
+        return os.write(self.fileno(), buf)
 
-    def truncate(self, size=None):
+    def invalidateCache(self):
         """
-        Always raises OSError.
+        Forget bus settings cached by this instance.
+
+        Bus settings are cached when read, so subsequent reads do not need an
+        ioctl. Writing a setting forgets its cached value, as the kernel may
+        store a different value than the one written (ex: bits_per_word 0
+        becoming 8, or unsupported spi_mode flags being dropped).
+        Setting spi_mode to its cached value does not issue an ioctl.
+        Call this method when settings may have been changed outside of this
+        instance (ex: by another process or another SPIBus instance using the
+        same device).
         """
-        raise OSError(errno.ENOTSUP)
+        self._cached_bits_per_word = None
+        self._cached_speed_hz = None
+        self._cached_spi_mode = None
+
+    def _ioctl(self, request, arg=0):
+        # fcntl.ioctl raises OSError on failure.
+        ioctl(self.fileno(), request, arg)
 
     @property
     def bits_per_word(self):
         """
         Current bus setting.
         """
-        result = ctypes.c_uint8()
-        self._ioctl(SPI_IOC_RD_BITS_PER_WORD, result)
-        return result.value
+        result = self._cached_bits_per_word
+        if result is None:
+            raw = ctypes.c_uint8()
+            self._ioctl(SPI_IOC_RD_BITS_PER_WORD, raw)
+            self._cached_bits_per_word = result = raw.value
+        return result
 
     @bits_per_word.setter
     def bits_per_word(self, value):
+        if not 0 <= value <= 0xff:
+            raise ValueError(f'bits_per_word out of range: {value}')
+        self._cached_bits_per_word = None
         self._ioctl(SPI_IOC_WR_BITS_PER_WORD, ctypes.c_uint8(value))
 
     @property
@@ -292,12 +861,18 @@ class SPIBus(io.FileIO):
         """
         Current bus setting.
         """
-        result = ctypes.c_uint32()
-        self._ioctl(SPI_IOC_RD_MAX_SPEED_HZ, result)
-        return result.value
+        result = self._cached_speed_hz
+        if result is None:
+            raw = ctypes.c_uint32()
+            self._ioctl(SPI_IOC_RD_MAX_SPEED_HZ, raw)
+            self._cached_speed_hz = result = raw.value
+        return result
 
     @speed_hz.setter
     def speed_hz(self, value):
+        if not 0 <= value <= 0xffffffff:
+            raise ValueError(f'speed_hz out of range: {value}')
+        self._cached_speed_hz = None
         self._ioctl(SPI_IOC_WR_MAX_SPEED_HZ, ctypes.c_uint32(value))
 
     @property
@@ -305,12 +880,25 @@ class SPIBus(io.FileIO):
         """
         Current bus setting.
         """
-        result = ctypes.c_uint8()
-        self._ioctl(SPI_IOC_RD_MODE32, result)
-        return result.value
+        result = self._cached_spi_mode
+        if result is None:
+            raw = ctypes.c_uint32()
+            self._ioctl(SPI_IOC_RD_MODE32, raw)
+            self._cached_spi_mode = result = raw.value
+        return result
 
     @spi_mode.setter
     def spi_mode(self, value):
+        # Plain int operations: avoid creating an SPIMode32 instance for each
+        # intermediate value.
+        value = int(value)
+        if value & _SPI_MODE_NON_USER_MASK:
+            raise ValueError(
+                f'mode bits outside of SPI_MODE_USER_MASK: {value:#x}',
+            )
+        if value == self._cached_spi_mode:
+            return
+        self._cached_spi_mode = None
         self._ioctl(SPI_IOC_WR_MODE32, ctypes.c_uint32(value))
 
     def submitTransferList(self, transfer_list):
@@ -319,10 +907,75 @@ class SPIBus(io.FileIO):
 
         Submits and executes a list of SPI transfers in one syscall.
 
-        Returns an iterator over individual transfers' rx_buf.
+        Returns a tuple of individual transfers' rx_buf.
+        """
+        ioctl(self.fileno(), *transfer_list.ioctl_args)
+        return transfer_list.rx_buf_tuple
+
+    def submitTransfer(self, transfer):
         """
-        self._ioctl(*transfer_list.ioctl_args)
-        return (x.rx_transfer for x in transfer_list)
+        transfer (SPITransfer)
+
+        Submits and executes a single, reusable SPI transfer.
+
+        Returns the transfer's rx_buf.
+        """
+        ioctl(self.fileno(), _SPI_IOC_MESSAGE_1, transfer.transfer)
+        return transfer.rx_buf
+
+    def writeSPI(self, tx_buf, speed_hz=0, bits_per_word=0):
+        """
+        Half-duplex transmission of tx_buf (bytes or buffer).
+
+        Unlike write, allows overriding the bus' speed_hz and bits_per_word
+        for this transfer only. Cheaper than transfer, as no SPITransfer is
+        created.
+
+        Returns the number of bytes transferred.
+        """
+        transfer = _getScratchTransfer()
+        length = len(tx_buf)
+        tx_buf_address, tx_buf_raw = _getBufferAddress(
+            tx_buf,
+            writable=False,
+        )
+        _PACK_TRANSFER_INTO(
+            transfer,
+            0,
+            tx_buf_address, 0, length, speed_hz, 0, bits_per_word,
+            0, 0, 0, 0, 0,
+        )
+        ioctl(self.fileno(), _SPI_IOC_MESSAGE_1, transfer)
+        # tx_buf_raw must stay referenced until the ioctl returns.
+        del tx_buf_raw
+        return length
+
+    def readintoSPI(self, rx_buf, speed_hz=0, bits_per_word=0):
+        """
+        Half-duplex reception into rx_buf (writable buffer).
+
+        Unlike readinto, allows overriding the bus' speed_hz and bits_per_word
+        for this transfer only. Cheaper than transfer, as no SPITransfer is
+        created.
+
+        Returns the number of bytes transferred.
+        """
+        transfer = _getScratchTransfer()
+        length = len(rx_buf)
+        rx_buf_address, rx_buf_raw = _getBufferAddress(
+            rx_buf,
+            writable=True,
+        )
+        _PACK_TRANSFER_INTO(
+            transfer,
+            0,
+            0, rx_buf_address, length, speed_hz, 0, bits_per_word,
+            0, 0, 0, 0, 0,
+        )
+        ioctl(self.fileno(), _SPI_IOC_MESSAGE_1, transfer)
+        # rx_buf_raw must stay referenced until the ioctl returns.
+        del rx_buf_raw
+        return length
 
     def transfer(self, *args, **kw):
         """
@@ -332,6 +985,8 @@ class SPIBus(io.FileIO):
 
         Returns the transfer's rx_buf.
         """
-        transfer = SPITransfer(*args, **kw)
-        self._ioctl(_SPI_IOC_MESSAGE_1, transfer.transfer)
+        # The transfer does not outlive this call, so it can use this thread's
+        # scratch spi_ioc_transfer instead of allocating one.
+        transfer = SPITransfer(*args, transfer=_getScratchTransfer(), **kw)
+        ioctl(self.fileno(), _SPI_IOC_MESSAGE_1, transfer.transfer)
         return transfer.rx_buf
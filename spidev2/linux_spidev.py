@@ -23,6 +23,7 @@ You should not have to import this file outside this package.
 
 import ctypes
 import enum
+import struct
 from ioctl_opt import IOW, IOR
 
 # pylint: disable=invalid-name
@@ -85,6 +86,11 @@ class spi_ioc_transfer(ctypes.Structure):
     )
 # pylint: enable=too-many-instance-attributes,too-few-public-methods
 
+# spi_ioc_transfer layout, to set all its fields in a single pack_into call.
+# Values must follow spi_ioc_transfer._fields_ order.
+spi_ioc_transfer_struct = struct.Struct('=QQIIHBBBBBB')
+assert spi_ioc_transfer_struct.size == ctypes.sizeof(spi_ioc_transfer)
+
 def SPI_IOC_MESSAGE(transfer_count):
     """
     spidev ioctl supporting multiple transfers in one ioctl syscall.
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2022  Vincent Pelletier <plr.vincent@gmail.com>
+#
+# This file is part of python-spidev2.
+# python-spidev2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-spidev2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with python-spidev2.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+spidev2 tests
+"""
@@ -0,0 +1,514 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2022  Vincent Pelletier <plr.vincent@gmail.com>
+#
+# This file is part of python-spidev2.
+# python-spidev2 is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-spidev2 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with python-spidev2.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Tests not needing SPI hardware: ioctl is replaced by a mock.
+"""
+
+import array
+import ctypes
+import gc
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+import weakref
+import spidev2
+from spidev2.linux_spidev import (
+    SPI_IOC_MESSAGE,
+    SPI_IOC_RD_BITS_PER_WORD,
+    SPI_IOC_RD_MODE32,
+    SPI_IOC_WR_BITS_PER_WORD,
+    SPI_IOC_WR_MODE32,
+    spi_ioc_transfer_struct,
+)
+
+def getAddress(buf):
+    """
+    Address of buf's first byte.
+    """
+    return ctypes.addressof(ctypes.c_char.from_buffer(buf))
+
+class SPIDev2Test(unittest.TestCase):
+    """
+    Tests for spidev2 module.
+    """
+    def setUp(self):
+        patcher = mock.patch('spidev2.ioctl')
+        self.ioctl = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.bus = bus = spidev2.SPIBus('/dev/null', 'r+')
+        self.addCleanup(bus.close)
+
+    def _getSubmittedArray(self, transfer_count):
+        """
+        Returns the spi_ioc_transfer array of the single ioctl issued so far,
+        checking its request number.
+        """
+        self.ioctl.assert_called_once()
+        fd, request, transfer_array = self.ioctl.call_args[0]
+        self.assertEqual(fd, self.bus.fileno())
+        self.assertEqual(request, SPI_IOC_MESSAGE(transfer_count))
+        return bytes(transfer_array)
+
+    def testSubmitTransferList(self):
+        """
+        submitTransferList issues a single ioctl with the packed transfers,
+        and returns the tuple of rx_bufs.
+        """
+        tx_buf = bytearray(b'\x12\x34')
+        rx_buf = bytearray(2)
+        both_buf = bytearray(3)
+        transfer_list = spidev2.SPITransferList((
+            {'tx_buf': tx_buf, 'speed_hz': 100_000},
+            {'rx_buf': rx_buf, 'cs_change': True, 'delay_usecs': 10},
+            {'tx_buf': both_buf, 'rx_buf': both_buf, 'bits_per_word': 8},
+        ))
+        result = self.bus.submitTransferList(transfer_list)
+        self.assertEqual(len(result), 3)
+        self.assertIsNone(result[0])
+        self.assertIs(result[1], rx_buf)
+        self.assertIs(result[2], both_buf)
+        self.assertIs(self.bus.submitTransferList(transfer_list), result)
+        self.ioctl.reset_mock()
+        self.bus.submitTransferList(transfer_list)
+        both_address = getAddress(both_buf)
+        self.assertEqual(
+            self._getSubmittedArray(3),
+            spi_ioc_transfer_struct.pack(
+                getAddress(tx_buf), 0, 2, 100_000, 0, 0, 0, 0, 0, 0, 0,
+            ) + spi_ioc_transfer_struct.pack(
+                0, getAddress(rx_buf), 2, 0, 10, 0, 1, 0, 0, 0, 0,
+            ) + spi_ioc_transfer_struct.pack(
+                both_address, both_address, 3, 0, 0, 8, 0, 0, 0, 0, 0,
+            ),
+        )
+
+    def testUpdateBuffers(self):
+        """
+        updateBuffers repoints the transfer, and the rx_buf tuple of its
+        transfer list follows.
+        """
+        rx_buf = bytearray(2)
+        transfer_list = spidev2.SPITransferList((
+            {'tx_buf': b'\x12\x34'},
+            {'rx_buf': rx_buf},
+        ))
+        self.assertIs(transfer_list.rx_buf_tuple[1], rx_buf)
+        new_rx_buf = bytearray(3)
+        new_tx_buf = bytearray(3)
+        transfer_list[1].updateBuffers(tx_buf=new_tx_buf, rx_buf=new_rx_buf)
+        self.assertIs(self.bus.submitTransferList(transfer_list)[1], new_rx_buf)
+        self.assertEqual(
+            self._getSubmittedArray(2)[32:],
+            spi_ioc_transfer_struct.pack(
+                getAddress(new_tx_buf), getAddress(new_rx_buf), 3,
+                0, 0, 0, 0, 0, 0, 0, 0,
+            ),
+        )
+        with self.assertRaises(ValueError):
+            transfer_list[1].updateBuffers(tx_buf=bytearray(2))
+
+    def testUpdateBuffersKeepsOtherBuffer(self):
+        """
+        updateBuffers only acquires the replaced buffer.
+        """
+        transfer = spidev2.SPITransfer(tx_buf=b'\x12\x34', rx_buf=bytearray(2))
+        tx_address = transfer.transfer.tx_buf
+        transfer.updateBuffers(rx_buf=bytearray(2))
+        # Immutable tx_buf was not copied again.
+        self.assertEqual(transfer.transfer.tx_buf, tx_address)
+        rx_address = transfer.transfer.rx_buf
+        transfer.updateBuffers(tx_buf=bytearray(2))
+        self.assertEqual(transfer.transfer.rx_buf, rx_address)
+        # A single-buffer transfer may change length.
+        transfer = spidev2.SPITransfer(rx_buf=bytearray(2))
+        transfer.updateBuffers(rx_buf=bytearray(5))
+        self.assertEqual(transfer.transfer.len, 5)
+
+    def testArrayInterfaceExportsBounded(self):
+        """
+        Repeated __array_interface__ accesses and tx_buf updates do not
+        accumulate rx_buf exports.
+        """
+        transfer = spidev2.SPITransfer(tx_buf=b'\x12', rx_buf=bytearray(1))
+        for _ in range(5):
+            transfer.updateBuffers(tx_buf=b'\x34')
+            transfer.__array_interface__ # pylint: disable=pointless-statement
+        self.assertEqual(
+            len(transfer._exported_rx_buf_raw_dict), # pylint: disable=protected-access
+            1,
+        )
+
+    def testTransferListRelease(self):
+        """
+        Deleting a transfer list releases its buffers without needing a
+        cyclic garbage collection.
+        """
+        buf = bytearray(2)
+        transfer_list = spidev2.SPITransferList(({
+            'tx_buf': buf,
+            'rx_buf': buf,
+        }, ))
+        with self.assertRaises(BufferError):
+            buf.extend(b'x')
+        gc.disable()
+        try:
+            del transfer_list
+            buf.extend(b'x')
+        finally:
+            gc.enable()
+
+    def testArrayInterfaceKeepsRxBufAlive(self):
+        """
+        An rx_buf exposed through __array_interface__ survives updateBuffers.
+        """
+        rx_buf = array.array('B', b'\x00\x00')
+        rx_buf_ref = weakref.ref(rx_buf)
+        transfer = spidev2.SPITransfer(rx_buf=rx_buf)
+        # pylint: disable=no-member
+        address, _ = transfer.__array_interface__['data']
+        # pylint: enable=no-member
+        self.assertEqual(address, rx_buf.buffer_info()[0])
+        del rx_buf
+        transfer.updateBuffers(rx_buf=bytearray(2))
+        self.assertIsNotNone(rx_buf_ref())
+
+    def testReverseBits(self):
+        """
+        reverseBits reverses bit order within each byte, in place.
+        """
+        buf = bytearray(b'\x01\x80\x0f\xf0\x12')
+        spidev2.reverseBits(buf)
+        self.assertEqual(buf, b'\x80\x01\xf0\x0f\x48')
+        buf = bytearray(range(256))
+        spidev2.reverseBits(buf)
+        spidev2.reverseBits(buf)
+        self.assertEqual(buf, bytes(range(256)))
+
+    def testCompileTransferSchedule(self):
+        """
+        compileTransferSchedule presets constant fields and patches buffer
+        addresses on each submission.
+        """
+        submit = spidev2.compileTransferSchedule((
+            {'len': 2, 'speed_hz': 10_000_000},
+            {'len': 3, 'cs_change': True},
+        ))
+        tx_buf = bytearray(2)
+        rx_buf = bytearray(3)
+        self.assertIs(
+            submit(self.bus, (tx_buf, None), (None, rx_buf))[1],
+            rx_buf,
+        )
+        self.assertEqual(
+            self._getSubmittedArray(2),
+            spi_ioc_transfer_struct.pack(
+                getAddress(tx_buf), 0, 2, 10_000_000, 0, 0, 0, 0, 0, 0, 0,
+            ) + spi_ioc_transfer_struct.pack(
+                0, getAddress(rx_buf), 3, 0, 0, 0, 1, 0, 0, 0, 0,
+            ),
+        )
+        with self.assertRaises(ValueError):
+            submit(self.bus, (bytearray(3), None), (None, rx_buf))
+        with self.assertRaises(ValueError):
+            spidev2.compileTransferSchedule(({'speed_hz': 1}, ))
+        with self.assertRaises(ValueError):
+            spidev2.compileTransferSchedule(({'len': 1, 'tx_buf': b'x'}, ))
+
+    def testRawArray(self):
+        """
+        raw_array gives write access to the submitted transfer array.
+        """
+        transfer_list = spidev2.SPITransferList((
+            {'tx_buf': b'\x12'},
+            {'rx_buf': bytearray(1)},
+        ))
+        raw_array = transfer_list.raw_array
+        self.assertEqual(raw_array.shape, (2, 32))
+        raw_array[1, 20] = 0x40
+        self.bus.submitTransferList(transfer_list)
+        self.assertEqual(self._getSubmittedArray(2)[52], 0x40)
+        with self.assertRaises(ValueError):
+            spidev2.SPITransferList(()).raw_array # pylint: disable=expression-not-assigned
+
+    def testRxBytes(self):
+        """
+        rx_bytes copies rx_buf's content.
+        """
+        rx_buf = (ctypes.c_char * 3)(b'a', b'b', b'c')
+        self.assertEqual(
+            spidev2.SPITransfer(rx_buf=rx_buf).rx_bytes,
+            b'abc',
+        )
+        self.assertIsNone(spidev2.SPITransfer(tx_buf=b'abc').rx_bytes)
+
+    def testBufferMethods(self):
+        """
+        __buffer__ returns a view on rx_buf, released by __release_buffer__.
+        """
+        rx_buf = bytearray(b'abc')
+        transfer = spidev2.SPITransfer(rx_buf=rx_buf)
+        view = transfer.__buffer__(0)
+        view[0] = ord('d')
+        self.assertEqual(rx_buf, b'dbc')
+        transfer.__release_buffer__(view)
+        self.assertRaises(ValueError, view.tobytes)
+
+    @unittest.skipIf(sys.version_info < (3, 12), 'PEP 688 needs python 3.12')
+    def testBufferProtocol(self):
+        """
+        SPITransfer exposes its rx_buf through the buffer protocol.
+        """
+        rx_buf = bytearray(b'abc')
+        transfer = spidev2.SPITransfer(tx_buf=b'xyz', rx_buf=rx_buf)
+        with memoryview(transfer) as view:
+            self.assertEqual(view.tobytes(), b'abc')
+            view[0] = ord('d')
+        self.assertEqual(rx_buf, b'dbc')
+
+    def testHalfDuplexSPI(self):
+        """
+        writeSPI and readintoSPI pack the current thread's scratch transfer
+        and return the transferred length.
+        """
+        tx_content_list = []
+        def ioctl(_, __, transfer):
+            tx_content_list.append(
+                ctypes.string_at(transfer.tx_buf, transfer.len),
+            )
+        self.ioctl.side_effect = ioctl
+        self.assertEqual(
+            self.bus.writeSPI(b'\x12\x34', speed_hz=1000, bits_per_word=16),
+            2,
+        )
+        self.assertEqual(tx_content_list, [b'\x12\x34'])
+        scratch = spidev2._getScratchTransfer() # pylint: disable=protected-access
+        self.assertIs(self.ioctl.call_args[0][2], scratch)
+        transfer_bytes = self._getSubmittedArray(1)
+        self.assertEqual(
+            transfer_bytes[16:],
+            spi_ioc_transfer_struct.pack(
+                0, 0, 2, 1000, 0, 16, 0, 0, 0, 0, 0,
+            )[16:],
+        )
+        self.ioctl.reset_mock()
+        self.ioctl.side_effect = None
+        rx_buf = bytearray(3)
+        self.assertEqual(self.bus.readintoSPI(rx_buf, speed_hz=2000), 3)
+        self.assertIs(self.ioctl.call_args[0][2], scratch)
+        self.assertEqual(
+            self._getSubmittedArray(1),
+            spi_ioc_transfer_struct.pack(
+                0, getAddress(rx_buf), 3, 2000, 0, 0, 0, 0, 0, 0, 0,
+            ),
+        )
+
+    def testTransferScratch(self):
+        """
+        SPIBus.transfer submits the current thread's scratch transfer.
+        """
+        rx_buf = bytearray(2)
+        self.assertIs(self.bus.transfer(b'\x12\x34', rx_buf), rx_buf)
+        scratch = spidev2._getScratchTransfer() # pylint: disable=protected-access
+        self.assertIs(self.ioctl.call_args[0][2], scratch)
+        self.assertEqual(scratch.rx_buf, getAddress(rx_buf))
+        self.assertEqual(scratch.len, 2)
+        other_scratch_list = []
+        thread = threading.Thread(
+            target=lambda: other_scratch_list.append(
+                spidev2._getScratchTransfer(), # pylint: disable=protected-access
+            ),
+        )
+        thread.start()
+        thread.join()
+        self.assertIsNot(other_scratch_list[0], scratch)
+
+    def testSPIMode(self):
+        """
+        spi_mode rejects unknown flags, and setting the value read from the
+        kernel does not issue an ioctl.
+        """
+        with self.assertRaises(ValueError):
+            self.bus.spi_mode = 1 << 16
+        self.ioctl.assert_not_called()
+        def ioctl(_, request, raw):
+            if request == SPI_IOC_RD_MODE32:
+                raw.value = spidev2.SPIMode32.SPI_MODE_3
+        self.ioctl.side_effect = ioctl
+        self.assertEqual(self.bus.spi_mode, spidev2.SPIMode32.SPI_MODE_3)
+        self.ioctl.reset_mock()
+        self.bus.spi_mode = spidev2.SPIMode32.SPI_MODE_3
+        self.ioctl.assert_not_called()
+        self.bus.spi_mode = spidev2.SPIMode32.SPI_MODE_0
+        request, raw = self.ioctl.call_args[0][1:]
+        self.assertEqual(request, SPI_IOC_WR_MODE32)
+        self.assertEqual(raw.value, spidev2.SPIMode32.SPI_MODE_0)
+        # Written value is not trusted: it is read back on next access.
+        self.ioctl.reset_mock()
+        self.assertEqual(self.bus.spi_mode, spidev2.SPIMode32.SPI_MODE_3)
+        self.ioctl.assert_called_once()
+
+    def testTransferPool(self):
+        """
+        Released transfers are recycled by shape, and only released once.
+        """
+        pool = spidev2.SPITransferPool()
+        transfer = pool.acquire(4, speed_hz=1000)
+        self.assertIs(transfer.tx_buf, transfer.rx_buf)
+        self.assertEqual(len(transfer.tx_buf), 4)
+        self.assertIsNot(pool.acquire(4, speed_hz=2000), transfer)
+        pool.release(transfer)
+        with self.assertRaises(ValueError):
+            pool.release(transfer)
+        with pool.acquire(4, speed_hz=1000) as other:
+            self.assertIs(other, transfer)
+        self.assertIs(pool.acquire(4, speed_hz=1000), transfer)
+        with self.assertRaises(ValueError):
+            spidev2.SPITransferPool().release(transfer)
+        with self.assertRaises(ValueError):
+            pool.release(spidev2.SPITransfer(tx_buf=bytearray(4)))
+        with self.assertRaises(TypeError):
+            transfer.updateBuffers(tx_buf=bytearray(8))
+        pool.release(transfer)
+        self.assertEqual(len(pool.acquire(4, speed_hz=1000).tx_buf), 4)
+
+    def testSettingCache(self):
+        """
+        Bus settings are cached when read, and re-read after being written.
+        """
+        def ioctl(_, request, raw):
+            if request == SPI_IOC_RD_BITS_PER_WORD:
+                # As the kernel does for bits_per_word 0.
+                raw.value = 8
+        self.ioctl.side_effect = ioctl
+        self.assertEqual(self.bus.bits_per_word, 8)
+        self.assertEqual(self.bus.bits_per_word, 8)
+        self.ioctl.assert_called_once()
+        self.ioctl.reset_mock()
+        self.bus.bits_per_word = 0
+        request, raw = self.ioctl.call_args[0][1:]
+        self.assertEqual(request, SPI_IOC_WR_BITS_PER_WORD)
+        self.assertEqual(raw.value, 0)
+        self.assertEqual(self.bus.bits_per_word, 8)
+        self.assertEqual(self.ioctl.call_count, 2)
+        self.ioctl.reset_mock()
+        self.bus.invalidateCache()
+        self.assertEqual(self.bus.bits_per_word, 8)
+        self.ioctl.assert_called_once()
+
+    def testSettingRange(self):
+        """
+        Out-of-range settings are rejected without reaching the kernel.
+        """
+        for name, value in (
+            ('bits_per_word', 256),
+            ('bits_per_word', -1),
+            ('speed_hz', 1 << 32),
+            ('speed_hz', -1),
+        ):
+            with self.assertRaises(ValueError):
+                setattr(self.bus, name, value)
+        self.ioctl.assert_not_called()
+
+class SPIBusTest(unittest.TestCase):
+    """
+    Tests for SPIBus file descriptor handling, using /dev/null.
+    """
+    def testMode(self):
+        """
+        Modes are parsed as io.FileIO does, and select read/write access.
+        """
+        for mode in ('', 'x', 'rw', 'rr', 'b', 'r+w', 'a'):
+            with self.assertRaises(ValueError):
+                spidev2.SPIBus('/dev/null', mode)
+        with spidev2.SPIBus('/dev/null', 'rb') as bus:
+            self.assertEqual(bus.read(4), b'')
+            self.assertEqual(bus.readinto(bytearray(4)), 0)
+            self.assertRaises(OSError, bus.write, b'foo')
+        with spidev2.SPIBus('/dev/null', 'w') as bus:
+            self.assertEqual(bus.write(b'foo'), 3)
+            self.assertRaises(OSError, bus.read, 4)
+        with spidev2.SPIBus('/dev/null', 'r+') as bus:
+            self.assertEqual(bus.write(b'foo'), 3)
+            self.assertEqual(bus.read(4), b'')
+
+    def testOpener(self):
+        """
+        opener is called to open the device, and its result must be valid.
+        """
+        opener = mock.Mock(side_effect=os.open)
+        with spidev2.SPIBus('/dev/null', 'w', opener=opener) as bus:
+            opener.assert_called_once()
+            path, flags = opener.call_args[0]
+            self.assertEqual(path, '/dev/null')
+            self.assertEqual(flags & os.O_ACCMODE, os.O_WRONLY)
+            self.assertTrue(flags & os.O_CLOEXEC)
+            self.assertEqual(bus.write(b'foo'), 3)
+        with self.assertRaises(ValueError):
+            spidev2.SPIBus('/dev/null', opener=lambda path, flags: -1)
+
+    def testFileDescriptor(self):
+        """
+        Already-open file descriptors are closed according to closefd.
+        """
+        fd = os.open('/dev/null', os.O_RDWR)
+        self.addCleanup(os.close, fd)
+        bus = spidev2.SPIBus(fd, 'r+', closefd=False)
+        self.assertEqual(bus.fileno(), fd)
+        bus.close()
+        os.fstat(fd)
+        fd2 = os.dup(fd)
+        spidev2.SPIBus(fd2, 'r+').close()
+        self.assertRaises(OSError, os.fstat, fd2)
+        with self.assertRaises(ValueError):
+            spidev2.SPIBus(-1, 'r+')
+        with self.assertRaises(ValueError):
+            spidev2.SPIBus('/dev/null', closefd=False)
+
+    def testClose(self):
+        """
+        Closed instances consistently raise ValueError.
+        """
+        bus = spidev2.SPIBus('/dev/null', 'r+')
+        self.assertFalse(bus.closed)
+        bus.close()
+        self.assertTrue(bus.closed)
+        bus.close()
+        for method, args in (
+            (bus.fileno, ()),
+            (bus.read, (4, )),
+            (bus.readinto, (bytearray(4), )),
+            (bus.write, (b'foo', )),
+            (bus.writeSPI, (b'foo', )),
+            (bus.readintoSPI, (bytearray(4), )),
+            (bus.transfer, (b'foo', )),
+            (bus.submitTransfer, (spidev2.SPITransfer(tx_buf=b'foo'), )),
+            (bus.submitTransferList, (
+                spidev2.SPITransferList(({'tx_buf': b'foo'}, )),
+            )),
+        ):
+            with self.assertRaises(ValueError):
+                method(*args)
+        with self.assertRaises(ValueError):
+            bus.bits_per_word # pylint: disable=pointless-statement
+        with self.assertRaises(ValueError):
+            bus.speed_hz = 1000
+
+if __name__ == '__main__':
+    unittest.main()